@@ -4,9 +4,14 @@ from math import radians
 from typing import Iterable, Iterator, Optional, Union, cast
 
 from OCP.Bnd import Bnd_Box
+from OCP.BRep import BRep_Tool
 from OCP.BRepAdaptor import BRepAdaptor_Curve
 from OCP.BRepBndLib import BRepBndLib
-from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeEdge, BRepBuilderAPI_MakeFace
+from OCP.BRepBuilderAPI import (
+    BRepBuilderAPI_MakeEdge,
+    BRepBuilderAPI_MakeFace,
+    BRepBuilderAPI_MakeWire,
+)
 from OCP.BRepFeat import BRepFeat
 from OCP.BRepLib import BRepLib_FindSurface
 from OCP.BRepTools import BRepTools
@@ -24,6 +29,7 @@ from OCP.Geom import (
     Geom_Circle,
     Geom_Curve,
     Geom_Ellipse,
+    Geom_Line,
     Geom_TrimmedCurve,
 )
 from OCP.GeomAbs import GeomAbs_CurveType, GeomAbs_Shape
@@ -49,6 +55,7 @@ from OCP.ShapeFix import ShapeFix_Face, ShapeFix_Wire
 from OCP.Standard import Standard_Failure
 from OCP.StdFail import StdFail_NotDone
 from OCP.TColgp import TColgp_Array1OfPnt
+from OCP.TopExp import TopExp
 from OCP.TopoDS import (
     TopoDS,
     TopoDS_Builder,
@@ -81,15 +88,22 @@ def make_compound(shapes: Iterable[TopoDS_Shape]) -> TopoDS_Compound:
 
 
 def bounding_box(
-    shape_or_shapes: Union[TopoDS_Shape, Iterable[TopoDS_Shape]]
+    shape_or_shapes: Union[TopoDS_Shape, Iterable[TopoDS_Shape]],
+    *,
+    optimal: bool = True,
 ) -> Bnd_Box:
-    bbox = Bnd_Box()
-    for shape in (
-        [shape_or_shapes]
+    """Compute the bounding box of one or several shapes;
+    non-`optimal` boxes are cheaper but may be loose."""
+    shape = (
+        shape_or_shapes
         if isinstance(shape_or_shapes, TopoDS_Shape)
-        else shape_or_shapes
-    ):
+        else make_compound(shape_or_shapes)
+    )
+    bbox = Bnd_Box()
+    if optimal:
         BRepBndLib.AddOptimal_s(shape, bbox)
+    else:
+        BRepBndLib.Add_s(shape, bbox)
     return bbox
 
 
@@ -102,6 +116,19 @@ def topoDS_iterator(
         iterator.Next()
 
 
+def topoDS_children(
+    shape: TopoDS_Shape, with_orientation: bool = True, with_location: bool = True
+) -> list[TopoDS_Shape]:
+    """Same as `topoDS_iterator` but collected into a list."""
+    children: list[TopoDS_Shape] = []
+    append = children.append
+    iterator = TopoDS_Iterator(shape, with_orientation, with_location)
+    while iterator.More():
+        append(iterator.Value())
+        iterator.Next()
+    return children
+
+
 #### faces
 
 
@@ -113,7 +140,7 @@ def face_outer_wire(face: TopoDS_Face) -> TopoDS_Wire:
 def face_inner_wires(face: TopoDS_Face) -> list[TopoDS_Wire]:
     """Find the inner wires of a face."""
     outer = face_outer_wire(face)
-    return [TopoDS.Wire_s(w) for w in topoDS_iterator(face) if not w.IsSame(outer)]
+    return [TopoDS.Wire_s(w) for w in topoDS_children(face) if not w.IsSame(outer)]
 
 
 def face_from_wires(
@@ -130,6 +157,9 @@ def face_from_wires(
     return face_fix.Face()
 
 
+BBoxBounds = tuple[float, float, float, float, float, float]
+
+
 class InvalidWiresForFace(ValueError):
     pass
 
@@ -139,45 +169,65 @@ def faces_from_wire_soup(wires: Iterable[TopoDS_Wire]) -> Iterable[TopoDS_Face]:
 
     wires = list(wires)
 
+    # check, close and make faces (and their bounding boxes) in a single pass;
+    # a face can only be inside another if its bounding box is too,
+    # so only run the (costly) exact check on candidate pairs
+    fixed_wires: list[TopoDS_Wire] = []
+    faces: list[TopoDS_Face] = []
+    bboxes: list[BBoxBounds] = []
     for wire in wires:
         if not are_wires_coplanar([wire]):
             raise InvalidWiresForFace("invalid wire")
 
-    if not are_wires_coplanar(wires):
+        # TODO split self intersecting wires?
+        fix = ShapeFix_Wire(wire, TopoDS_Face(), _TOLERANCE)
+        fix.FixClosed()
+        fix.FixConnected()
+        fixed_wire = fix.Wire()
+        face = BRepBuilderAPI_MakeFace(fixed_wire, True).Face()
+        fixed_wires.append(fixed_wire)
+        faces.append(face)
+        bboxes.append(bounding_box(face).Get())
+
+    if not _are_axis_plane_aligned(wires) and not are_wires_coplanar(wires):
         raise InvalidWiresForFace("wires are not coplanar")
 
-    def fix_wires():
-        for wire in wires:
-            # TODO split self intersecting wires?
-            fix = ShapeFix_Wire(wire, TopoDS_Face(), _TOLERANCE)
-            fix.FixClosed()
-            fix.FixConnected()
-            yield fix.Wire()
-
-    faces = [BRepBuilderAPI_MakeFace(wire, True).Face() for wire in fix_wires()]
-
     if len(faces) < 2:
         yield from faces
         return
 
-    included_in: dict[int, set[int]] = {}
-    for i, face_i in enumerate(faces):
-        for j, face_j in enumerate(faces):
-            if i != j and BRepFeat.IsInside_s(face_i, face_j):
-                included_in.setdefault(i, set()).add(j)
+    by_xmin = sorted(range(len(faces)), key=lambda i: bboxes[i][0])
+
+    # bit j of included_in[i] is set when face i is inside face j;
+    # nesting is antisymmetric so each pair needs at most one positive check
+    included_in = [0] * len(faces)
+    for k, i in enumerate(by_xmin):
+        xmax_i = bboxes[i][3]
+        for j in by_xmin[k + 1 :]:
+            if bboxes[j][0] > xmax_i + _TOLERANCE:
+                break  # this and all further boxes are clear of face i's
+            if _bbox_contains(bboxes[j], bboxes[i]) and BRepFeat.IsInside_s(
+                faces[i], faces[j]
+            ):
+                included_in[i] |= 1 << j
+            elif _bbox_contains(bboxes[i], bboxes[j]) and BRepFeat.IsInside_s(
+                faces[j], faces[i]
+            ):
+                included_in[j] |= 1 << i
+
+    depths = [bin(ancestors).count("1") for ancestors in included_in]
 
     WireListPair = tuple[list[TopoDS_Wire], list[TopoDS_Wire]]
     outers_and_inners: dict[int, WireListPair] = {}
 
-    for i in range(len(faces)):
-        ancestors = included_in.get(i, set())
-        if len(ancestors) % 2:  # odd depth: inner ring
-            parent_i = max(ancestors, key=lambda i: len(included_in.get(i, set())))
+    for i, ancestors in enumerate(included_in):
+        if depths[i] % 2:  # odd depth: inner ring
+            parent_i = max(_set_bits(ancestors), key=depths.__getitem__)
             _, inners = outers_and_inners.setdefault(parent_i, ([], []))
-            inners.append(face_outer_wire(faces[i]))
+            inners.append(fixed_wires[i])
         else:  # even depth: outer ring
             outers, _ = outers_and_inners.setdefault(i, ([], []))
-            outers.append(face_outer_wire(faces[i]))
+            outers.append(fixed_wires[i])
 
     for outers, inners in outers_and_inners.values():
         if len(outers) == 1:
@@ -190,11 +240,35 @@ def faces_from_wire_soup(wires: Iterable[TopoDS_Wire]) -> Iterable[TopoDS_Face]:
                 yield face_from_wires(path)
 
 
+def _set_bits(mask: int) -> Iterator[int]:
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def _bbox_contains(outer: BBoxBounds, inner: BBoxBounds) -> bool:
+    oxmin, oymin, ozmin, oxmax, oymax, ozmax = outer
+    ixmin, iymin, izmin, ixmax, iymax, izmax = inner
+    tol = _TOLERANCE
+    return (
+        oxmin <= ixmin + tol
+        and ixmax <= oxmax + tol
+        and oymin <= iymin + tol
+        and iymax <= oymax + tol
+        and ozmin <= izmin + tol
+        and izmax <= ozmax + tol
+    )
+
+
 #### wires
 
 
 def is_wire_closed(wire: TopoDS_Wire) -> bool:
     """Check whether a wire is closed."""
+    if BRep_Tool.IsClosed_s(wire):
+        return True
+    # `CheckClosed` flags ends that coincide without sharing a vertex
     a = ShapeAnalysis_Wire(wire, BRepBuilderAPI_MakeFace(wire).Face(), _TOLERANCE)
     return a.CheckClosed()
 
@@ -207,52 +281,90 @@ def are_wires_coplanar(wires: Iterable[TopoDS_Wire]) -> bool:
     )
 
 
+def _are_axis_plane_aligned(shapes: Iterable[TopoDS_Shape]) -> bool:
+    """Cheaply check whether shapes all lie in one plane parallel to XY, YZ or ZX
+    (e.g. any 2D SVG input); a negative result is inconclusive."""
+    bbox = bounding_box(shapes, optimal=False)
+    return not bbox.IsVoid() and (
+        bbox.IsZThin(_TOLERANCE) or bbox.IsXThin(_TOLERANCE) or bbox.IsYThin(_TOLERANCE)
+    )
+
+
+# BRepBuilderAPI_MakeWire merges coincident vertices, which saves the
+# ShapeFix_Wire passes further down, but it scales worse than linearly
+# (about 2x slower than ShapeExtend_WireData end to end at 2000 edges),
+# so it is only used for short chains; callers must not rely on the
+# edges of a wire sharing vertices
+_MAKE_WIRE_MAX_EDGES = 10
+
+
 def wire_from_continuous_edges(
     edges: Iterable[TopoDS_Edge], *, closed: bool = False
 ) -> TopoDS_Wire:
     """Make a single wire from known-continuous edges;
     with no reordering nor any checking."""
-    extend = ShapeExtend_WireData(TopoDS_Wire())
-    for edge in edges:
-        extend.AddOriented(edge, 0)
+    edges = list(edges)
+    wire = None
+
+    if len(edges) <= _MAKE_WIRE_MAX_EDGES:
+        make_wire = BRepBuilderAPI_MakeWire()
+        for edge in edges:
+            make_wire.Add(edge)
+            # a later edge may reset the done state, so check every time
+            if not make_wire.IsDone():
+                break
+        else:
+            wire = make_wire.Wire()
+
+    if wire is None:
+        extend = ShapeExtend_WireData(TopoDS_Wire())
+        for edge in edges:
+            extend.AddOriented(edge, 0)
+        wire = extend.Wire()
 
-    wire = extend.Wire()
     return closed_wire(wire) if closed else wire
 
 
-def closed_wire(wire: TopoDS_Wire) -> TopoDS_Wire:
+def closed_wire(wire: TopoDS_Wire, *, skip_repair: bool = False) -> TopoDS_Wire:
     """Ensure a wire is closed.
     - if already closed return it untouched.
-    - otherwise return a new wire with a closing segment appended."""
+    - otherwise return a new wire with a closing segment appended.
+    With `skip_repair`, the wire is not passed through `ShapeFix_Wire`
+    if it is already topologically closed after appending that segment."""
 
     if is_wire_closed(wire):
         return wire
 
-    it = topoDS_iterator(wire)
-    try:
-        first_edge = next(it)
-        last_edge = next(it)
-        while True:
-            try:
-                last_edge = next(it)
-            except StopIteration:
-                break
-    except StopIteration:
-        # wire has fewer that 2 edges
+    edges = topoDS_children(wire)
+    if len(edges) < 2:
         return wire
+    first_edge, last_edge = TopoDS.Edge_s(edges[0]), TopoDS.Edge_s(edges[-1])
 
-    adaptor = BRepAdaptor_Curve(TopoDS.Edge_s(first_edge))
-    start = adaptor.Value(adaptor.FirstParameter())
+    u0, u1 = BRep_Tool.Range_s(first_edge)
+    start = BRep_Tool.Curve_s(first_edge, u0, u1).Value(u0)
 
-    adaptor = BRepAdaptor_Curve(TopoDS.Edge_s(last_edge))
-    end = adaptor.Value(adaptor.LastParameter())
+    u0, u1 = BRep_Tool.Range_s(last_edge)
+    end = BRep_Tool.Curve_s(last_edge, u0, u1).Value(u1)
 
     if not start.IsEqual(end, _TOLERANCE):
         extend = ShapeExtend_WireData()
         extend.AddOriented(wire, 0)
-        extend.AddOriented(edge_from_curve(segment_curve(end, start)), 0)
+        closing_curve = segment_curve_unchecked(end, start)
+        make_edge = BRepBuilderAPI_MakeEdge(
+            closing_curve,
+            TopExp.LastVertex_s(last_edge),
+            TopExp.FirstVertex_s(first_edge),
+        )
+        # fails if the gap is within the end vertices' tolerance
+        closing_edge = (
+            make_edge.Edge() if make_edge.IsDone() else edge_from_curve(closing_curve)
+        )
+        extend.AddOriented(closing_edge, 0)
         wire = extend.Wire()
 
+    if skip_repair and BRep_Tool.IsClosed_s(wire):
+        return wire
+
     fix = ShapeFix_Wire(wire, TopoDS_Face(), _TOLERANCE)
     fix.FixClosed()
     fix.FixConnected()
@@ -285,6 +397,12 @@ def segment_curve(start: gp_Pnt, end: gp_Pnt) -> Geom_TrimmedCurve:
         raise ValueError(f"could not make segment curve from {start}, {end}", e)
 
 
+def segment_curve_unchecked(start: gp_Pnt, end: gp_Pnt) -> Geom_TrimmedCurve:
+    """Make a segment curve between points known to be distinct."""
+    line = Geom_Line(start, gp_Dir(gp_Vec(start, end)))
+    return Geom_TrimmedCurve(line, 0, start.Distance(end))
+
+
 def bezier_curve(*controls: gp_Pnt) -> Geom_BezierCurve:
     n = len(controls)
     if not 2 <= n <= BEZIER_MAX_DEGREE:
@@ -293,12 +411,22 @@ def bezier_curve(*controls: gp_Pnt) -> Geom_BezierCurve:
         )
 
     poles = TColgp_Array1OfPnt(1, n)
+    set_pole = poles.SetValue
     for i, control in enumerate(controls, 1):
-        poles.SetValue(i, control)
+        set_pole(i, control)
 
     return Geom_BezierCurve(poles)
 
 
+_Z_DIR = gp_Dir(0, 0, 1)
+_XY_AX2 = gp_Ax2(gp_Pnt(), _Z_DIR)
+
+
+def _origin_ax2(normal: gp_Dir) -> gp_Ax2:
+    # gp_Circ/gp_Elips copy their axes, so the default one can be shared
+    return _XY_AX2 if normal is _Z_DIR else gp_Ax2(gp_Pnt(), normal)
+
+
 def circle_curve(
     radius: float,
     start_angle: float = 360,
@@ -306,22 +434,53 @@ def circle_curve(
     *,
     clockwise: bool = False,
     center: gp_Pnt = gp_Pnt(0, 0, 0),
-    normal: gp_Dir = gp_Dir(0, 0, 1),
+    normal: gp_Dir = _Z_DIR,
 ) -> Union[Geom_Circle, Geom_TrimmedCurve]:
-    circle_gp = gp_Circ(gp_Ax2(gp_Pnt(), normal), radius)
+    circle = _circle_or_arc(
+        gp_Circ(_origin_ax2(normal), radius), start_angle, end_angle, clockwise
+    )
+    if center.X() or center.Y() or center.Z():
+        circle.Transform(_translation(center))
+    return circle
+
 
+def circle_curves(
+    arcs: Iterable[tuple[float, float, float]],
+    *,
+    clockwise: bool = False,
+    center: gp_Pnt = gp_Pnt(0, 0, 0),
+    normal: gp_Dir = _Z_DIR,
+) -> list[Union[Geom_Circle, Geom_TrimmedCurve]]:
+    """Make circles (or arcs) from `(radius, start_angle, end_angle)` triples,
+    all sharing the same center and normal."""
+    ax2 = _origin_ax2(normal)
+    trsf = _translation(center) if center.X() or center.Y() or center.Z() else None
+
+    circles: list[Union[Geom_Circle, Geom_TrimmedCurve]] = []
+    for radius, start_angle, end_angle in arcs:
+        circle = _circle_or_arc(gp_Circ(ax2, radius), start_angle, end_angle, clockwise)
+        if trsf is not None:
+            circle.Transform(trsf)
+        circles.append(circle)
+
+    return circles
+
+
+def _circle_or_arc(
+    circle_gp: gp_Circ, start_angle: float, end_angle: float, clockwise: bool
+) -> Union[Geom_Circle, Geom_TrimmedCurve]:
     if start_angle == end_angle:
-        circle = GC_MakeCircle(circle_gp).Value()
+        return GC_MakeCircle(circle_gp).Value()
     else:
-        circle = GC_MakeArcOfCircle(
+        return GC_MakeArcOfCircle(
             circle_gp, radians(start_angle), radians(end_angle), clockwise
         ).Value()
 
-    trsf = gp_Trsf()
-    trsf.SetTranslation(gp_Vec(center.XYZ()))
-    circle.Transform(trsf)
 
-    return circle
+def _translation(offset: gp_Pnt) -> gp_Trsf:
+    trsf = gp_Trsf()
+    trsf.SetTranslation(gp_Vec(offset.XYZ()))
+    return trsf
 
 
 def ellipse_curve(
@@ -333,13 +492,13 @@ def ellipse_curve(
     clockwise: bool = False,
     rotation: float = 0,
     center: gp_Pnt = gp_Pnt(0, 0, 0),
-    normal: gp_Dir = gp_Dir(0, 0, 1),
+    normal: gp_Dir = _Z_DIR,
 ) -> Union[Geom_Ellipse, Geom_TrimmedCurve]:
     if minor_radius > major_radius:
         major_radius, minor_radius = minor_radius, major_radius
         rotation += 90
 
-    ellipse_gp = gp_Elips(gp_Ax2(gp_Pnt(), normal), major_radius, minor_radius).Rotated(
+    ellipse_gp = gp_Elips(_origin_ax2(normal), major_radius, minor_radius).Rotated(
         gp_Ax1(), radians(rotation)
     )
     if start_angle == end_angle:
@@ -352,9 +511,8 @@ def ellipse_curve(
             clockwise,
         ).Value()
 
-    trsf = gp_Trsf()
-    trsf.SetTranslation(gp_Vec(center.XYZ()))
-    ellipse.Transform(trsf)
+    if center.X() or center.Y() or center.Z():
+        ellipse.Transform(_translation(center))
 
     return ellipse
 
@@ -370,6 +528,14 @@ def curve_to_beziers(
     max_degree: int = 3,
     max_segments: int = 100,
 ) -> Iterator[Geom_BezierCurve]:
+    if (
+        isinstance(curve_or_adaptor, Geom_BezierCurve)
+        and curve_or_adaptor.Degree() <= max_degree
+        and not curve_or_adaptor.IsRational()
+    ):
+        yield cast(Geom_BezierCurve, curve_or_adaptor.Copy())
+        return
+
     curve, adaptor = curve_and_adaptor(curve_or_adaptor)
     curve_type = adaptor.GetType()
 
@@ -433,8 +599,9 @@ def bspline_to_beziers(
             raise ValueError(f"could not approximate b-spline {bspline}")
 
     bez_convert = GeomConvert_BSplineCurveToBezierCurve(bspline)
-    for i in range(bez_convert.NbArcs()):
-        yield bez_convert.Arc(i + 1)
+    arc = bez_convert.Arc
+    for i in range(1, bez_convert.NbArcs() + 1):
+        yield arc(i)
 
 
 def curve_to_polyline(
@@ -454,8 +621,9 @@ def curve_to_polyline(
     else:
         points = GCPnts_QuasiUniformDeflection(adaptor, tolerance, start, end)
         if points.IsDone():
-            for i in range(points.NbPoints()):
-                yield points.Value(i + 1)
+            point = points.Value
+            for i in range(1, points.NbPoints() + 1):
+                yield point(i)
         else:
             raise ValueError("could not convert to polyline")
 
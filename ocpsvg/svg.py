@@ -359,15 +359,10 @@ def continuous_edges_from_svg_path(
     ):
         if isinstance(segment, svgpathtools.Line):
             return segment_curve(p(segment.start), p(segment.end))
-        elif isinstance(segment, svgpathtools.QuadraticBezier):
-            return bezier_curve(p(segment.start), p(segment.control), p(segment.end))
-        elif isinstance(segment, svgpathtools.CubicBezier):
-            return bezier_curve(
-                p(segment.start),
-                p(segment.control1),
-                p(segment.control2),
-                p(segment.end),
-            )
+        elif isinstance(
+            segment, (svgpathtools.QuadraticBezier, svgpathtools.CubicBezier)
+        ):
+            return bezier_curve(*map(p, segment.bpoints()))
         elif isinstance(segment, svgpathtools.Arc):
             start_angle = segment.theta
             end_angle = segment.theta + segment.delta
@@ -533,8 +528,15 @@ def curve_to_svg_path(
             )
 
         elif use_cubics or use_quadratics:
+            # bezier curves can skip the adaptor altogether
             beziers = curve_to_beziers(
-                adaptor, tolerance=tolerance, max_degree=3 if use_cubics else 2
+                (
+                    curve_or_adaptor
+                    if isinstance(curve_or_adaptor, Geom_BezierCurve)
+                    else adaptor
+                ),
+                tolerance=tolerance,
+                max_degree=3 if use_cubics else 2,
             )
             for i, bezier in enumerate(beziers):
                 yield from bezier_to_svg_path(
@@ -638,13 +640,12 @@ def polyline_to_svg_path(
     with_first_move: bool = True,
     closed: bool = False,
 ) -> Iterable[SvgPathCommand]:
-    points = list(points)
-    if points:
-        first, *others = points
-
+    points = iter(points)
+    first = next(points, None)
+    if first is not None:
         if with_first_move:
             yield "M", first.X(), first.Y()
-        for point in others:
+        for point in points:
             yield "L", point.X(), point.Y()
 
         if closed:
@@ -1,21 +1,35 @@
+from math import cos, pi, sin
 from typing import Iterable, Union
 
 import pytest
+from OCP.BRep import BRep_Tool
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakePolygon
 from OCP.Geom import Geom_BezierCurve, Geom_Curve, Geom_TrimmedCurve
+from OCP.GeomAdaptor import GeomAdaptor_Curve
+from OCP.ShapeExtend import ShapeExtend_WireData
 from OCP.gp import gp_Pnt, gp_Vec
 from pytest import approx, raises
 
 from ocpsvg.ocp import (
+    _MAKE_WIRE_MAX_EDGES,
+    InvalidWiresForFace,
     bezier_curve,
+    bounding_box,
     circle_curve,
+    circle_curves,
+    closed_wire,
     curve_to_beziers,
     curve_to_bspline,
     curve_to_polyline,
     edge_from_curve,
     ellipse_curve,
+    face_from_wires,
     faces_from_wire_soup,
     is_wire_closed,
     segment_curve,
+    segment_curve_unchecked,
+    topoDS_children,
+    topoDS_iterator,
     wire_from_continuous_edges,
 )
 from tests.ocp import face_area
@@ -52,6 +66,23 @@ def test_segment_curve(a: gp_Pnt, b: gp_Pnt):
     assert isinstance(segment_curve(a, b), Geom_Curve)
 
 
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        (Pnt(0, 0), Pnt(1, 0)),
+        (Pnt(0, 0), Pnt(0, 12)),
+        (Pnt(0, 0, 0), Pnt(0, 12, 34)),
+    ],
+)
+def test_segment_curve_unchecked(a: gp_Pnt, b: gp_Pnt):
+    curve = segment_curve_unchecked(a, b)
+    expected = segment_curve(a, b)
+    assert curve.StartPoint().IsEqual(a, 1e-9)
+    assert curve.EndPoint().IsEqual(b, 1e-9)
+    assert curve.FirstParameter() == approx(expected.FirstParameter())
+    assert curve.LastParameter() == approx(expected.LastParameter())
+
+
 @pytest.mark.parametrize(
     "a,b",
     [
@@ -141,11 +172,64 @@ def test_curve_to_beziers_deg4(curve: Geom_Curve):
     )
 
 
+@pytest.mark.parametrize(
+    "curve", [c for c in VARIOUS_CURVES if isinstance(c, Geom_BezierCurve)]
+)
+def test_bezier_curve_to_beziers(curve: Geom_BezierCurve):
+    def poles(bezier: Geom_BezierCurve):
+        return [as_tuple(bezier.Pole(i)) for i in range(1, bezier.NbPoles() + 1)]
+
+    for max_degree in (3, 4):
+        fast = list(curve_to_beziers(curve, tolerance=1e-6, max_degree=max_degree))
+        slow = list(
+            curve_to_beziers(
+                GeomAdaptor_Curve(curve), tolerance=1e-6, max_degree=max_degree
+            )
+        )
+        assert len(fast) == len(slow)
+        for a, b in zip(fast, slow):
+            assert poles(a) == approx(poles(b))
+
+    # results are copies, changing them leaves the input untouched
+    original = poles(curve)
+    for bezier in curve_to_beziers(curve, tolerance=1e-6, max_degree=4):
+        bezier.Segment(0.25, 0.75)
+    assert poles(curve) == approx(original)
+
+
 @pytest.mark.parametrize("curve", VARIOUS_CURVES)
 def test_curve_to_polyline(curve: Geom_Curve):
     assert all(isinstance(p, gp_Pnt) for p in curve_to_polyline(curve, tolerance=1e-5))
 
 
+@pytest.mark.parametrize("optimal", [True, False])
+def test_bounding_box(optimal: bool):
+    edges = [
+        edge_from_curve(segment_curve(Pnt(0, 0), Pnt(10, 5))),
+        edge_from_curve(circle_curve(2, center=Pnt(10, 10, 3))),
+    ]
+    xmin, ymin, zmin, xmax, ymax, zmax = bounding_box(edges, optimal=optimal).Get()
+    assert (xmin, ymin, zmin) == approx((0, 0, 0), abs=1e-6)
+    assert (xmax, ymax, zmax) == approx((12, 12, 3), abs=1e-6 if optimal else 1)
+    assert bounding_box(edges[0], optimal=optimal).Get() == approx(
+        (0, 0, 0, 10, 5, 0), abs=1e-6
+    )
+
+
+def test_circle_curves():
+    arcs = [(12, 360, 360), (3, 30, 210), (5, 210, 30)]
+    center = Pnt(1, 2, 3)
+    curves = circle_curves(arcs, clockwise=True, center=center)
+    assert len(curves) == len(arcs)
+    for curve, (radius, start, end) in zip(curves, arcs):
+        expected = circle_curve(radius, start, end, clockwise=True, center=center)
+        for u, v in (
+            (curve.FirstParameter(), expected.FirstParameter()),
+            (curve.LastParameter(), expected.LastParameter()),
+        ):
+            assert curve.Value(u).IsEqual(expected.Value(v), 1e-9)
+
+
 def test_is_wire_closed():
     a = gp_Pnt(0, 0, 0)
     b = gp_Pnt(10, 0, 0)
@@ -156,6 +240,101 @@ def test_is_wire_closed():
     assert is_wire_closed(polyline_wire(a, b, c, a))
     assert is_wire_closed(polyline_wire(a, b, c, d, a))
 
+    # ends that coincide with or without sharing a vertex
+    polygon = BRepBuilderAPI_MakePolygon(a, b, c, d, True).Wire()
+    assert BRep_Tool.IsClosed_s(polygon)
+    assert is_wire_closed(polygon)
+    assert is_wire_closed(wire_data_polyline(a, b, c, d, a))
+    assert not is_wire_closed(wire_data_polyline(a, b, c, d))
+
+
+def test_topoDS_children():
+    wire = polyline_wire(Pnt(0, 0), Pnt(1, 0), Pnt(1, 1), Pnt(0, 1))
+    children = topoDS_children(wire)
+    assert len(children) == 3
+    assert all(a.IsEqual(b) for a, b in zip(children, topoDS_iterator(wire)))
+
+
+def test_closed_wire():
+    a = gp_Pnt(0, 0, 0)
+    b = gp_Pnt(10, 0, 0)
+    c = gp_Pnt(10, 10, 0)
+    closed = closed_wire(polyline_wire(a, b, c))
+    assert BRep_Tool.IsClosed_s(closed)
+    assert face_area(face_from_wires(closed)) == approx(50.0)
+
+    polygon = BRepBuilderAPI_MakePolygon(a, b, c).Wire()
+    closed = closed_wire(polygon, skip_repair=True)
+    assert BRep_Tool.IsClosed_s(closed)
+    assert face_area(face_from_wires(closed)) == approx(50.0)
+
+    # edges without shared vertices still need repairing
+    closed = closed_wire(wire_data_polyline(a, b, c), skip_repair=True)
+    assert BRep_Tool.IsClosed_s(closed)
+    assert face_area(face_from_wires(closed)) == approx(50.0)
+
+    already_closed = polyline_wire(a, b, c, a)
+    assert closed_wire(already_closed) is already_closed
+
+    # gap above _TOLERANCE but within the vertices' tolerance
+    almost_a = gp_Pnt(0, 5e-8, 0)
+    d = gp_Pnt(0, 10, 0)
+    for skip_repair in (False, True):
+        closed = closed_wire(
+            wire_data_polyline(a, b, c, d, almost_a), skip_repair=skip_repair
+        )
+        assert face_area(face_from_wires(closed)) == approx(100.0)
+
+
+@pytest.mark.parametrize("n", [_MAKE_WIRE_MAX_EDGES, _MAKE_WIRE_MAX_EDGES + 1])
+def test_wire_from_continuous_edges(n: int):
+    # regular polygon, with the last point slightly off the first one
+    r = 5
+    points = [Pnt(r * cos(2 * pi * i / n), r * sin(2 * pi * i / n)) for i in range(n)]
+    almost_first = Pnt(r, 5e-8)
+    area = n * r**2 * sin(2 * pi / n) / 2
+
+    edges = [
+        edge_from_curve(segment_curve(p, q))
+        for p, q in zip(points, [*points[1:], almost_first])
+    ]
+    wire = wire_from_continuous_edges(edges)
+    assert len(topoDS_children(wire)) == n
+    assert is_wire_closed(polyline_wire(*points, points[0]))
+
+    closed = wire_from_continuous_edges(edges, closed=True)
+    assert face_area(face_from_wires(closed)) == approx(area)
+
+    for skip_repair in (False, True):
+        closed = closed_wire(wire, skip_repair=skip_repair)
+        assert face_area(face_from_wires(closed)) == approx(area)
+
+
+def test_wire_from_disconnected_edges():
+    edges = [
+        edge_from_curve(segment_curve(Pnt(0, 0), Pnt(1, 0))),
+        edge_from_curve(segment_curve(Pnt(2, 0), Pnt(3, 0))),
+    ]
+    assert len(topoDS_children(wire_from_continuous_edges(edges))) == 2
+
+    # disconnected edge in the middle, followed by connected ones
+    a, b, c = Pnt(0, 0), Pnt(10, 0), Pnt(10, 10)
+    edges = [
+        edge_from_curve(segment_curve(a, b)),
+        edge_from_curve(segment_curve(Pnt(10, 1e-6), c)),
+        edge_from_curve(segment_curve(c, a)),
+    ]
+    assert len(topoDS_children(wire_from_continuous_edges(edges))) == 3
+    closed = wire_from_continuous_edges(edges, closed=True)
+    assert face_area(face_from_wires(closed)) == approx(50.0)
+
+    edges = [
+        edge_from_curve(segment_curve(a, b)),
+        edge_from_curve(segment_curve(Pnt(5, 5), Pnt(6, 6))),
+        edge_from_curve(segment_curve(b, c)),
+    ]
+    assert len(topoDS_children(wire_from_continuous_edges(edges))) == 3
+
 
 def test_face_from_wire_soup_winding():
     a = gp_Pnt(0, 0, 0)
@@ -182,6 +361,48 @@ def test_face_from_wire_soup_winding():
     assert faces_area_from_rings([d, c, b, a], [h, g, f, e]) == approx([75.0])
 
 
+def test_faces_from_wire_soup_nesting():
+    def square_wire(x: float, y: float, size: float):
+        a = Pnt(x, y)
+        b = Pnt(x + size, y)
+        c = Pnt(x + size, y + size)
+        d = Pnt(x, y + size)
+        return polyline_wire(a, b, c, d, a)
+
+    wires = [
+        square_wire(2, 2, 6),
+        square_wire(20, 0, 5),
+        square_wire(0, 0, 10),
+        square_wire(4, 4, 2),
+        square_wire(1, 1, 8),
+    ]
+    areas = sorted(face_area(f) for f in faces_from_wire_soup(wires))
+    assert areas == approx([25.0, 32.0, 36.0])
+
+
+def test_faces_from_wire_soup_not_coplanar():
+    a = Pnt(0, 0, 0)
+    b = Pnt(10, 0, 0)
+    c = Pnt(10, 10, 0)
+    d = Pnt(0, 10, 0)
+    e = Pnt(0, 0, 5)
+    f = Pnt(10, 0, 5)
+
+    with raises(InvalidWiresForFace):
+        list(
+            faces_from_wire_soup(
+                [polyline_wire(a, b, c, a), polyline_wire(e, f, d, e)],
+            )
+        )
+
+
+def wire_data_polyline(*points: gp_Pnt):
+    extend = ShapeExtend_WireData()
+    for p, q in zip(points, points[1:]):
+        extend.AddOriented(edge_from_curve(segment_curve(p, q)), 0)
+    return extend.Wire()
+
+
 def polyline_wire(*points: gp_Pnt):
     return wire_from_continuous_edges(
         edge_from_curve(segment_curve(p, q)) for p, q in zip(points, points[1:])
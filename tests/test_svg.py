@@ -30,6 +30,7 @@ from ocpsvg.svg import (
     ColorAndLabel,
     SvgPathCommand,
     bezier_to_svg_path,
+    curve_to_svg_path,
     edge_to_svg_path,
     edges_from_svg_path,
     faces_from_svg_path,
@@ -113,6 +114,26 @@ def test_edge_to_svg(curve: Geom_Curve, svg_d: str, opts: dict[str, Any]):
     assert svg_path_tokens(path) == approx(svg_path_tokens(svg_d), abs=1e-4), str(path)
 
 
+@pytest.mark.parametrize(
+    "curve, opts",
+    [
+        (bezier_curve(*as_Pnts((0, 1), (3, 2), (4, 5))), {}),
+        (bezier_curve(*as_Pnts((0, 1), (3, 2), (4, 5))), dict(use_cubics=False)),
+        (bezier_curve(*as_Pnts((0, 1), (3, 2), (4, 5), (7, 8))), {}),
+        (
+            bezier_curve(*as_Pnts((0, 1), (3, 2), (4, 5), (7, 8), (9, 3))),
+            dict(use_cubics=False),
+        ),
+    ],
+)
+def test_curve_to_svg_same_as_edge(curve: Geom_Curve, opts: dict[str, Any]):
+    from_curve = SvgPath(curve_to_svg_path(curve, tolerance=1e-5, **opts))
+    from_edge = SvgPath(
+        edge_to_svg_path(edge_from_curve(curve), tolerance=1e-5, **opts)
+    )
+    assert svg_path_tokens(from_curve) == approx(svg_path_tokens(from_edge))
+
+
 @pytest.mark.parametrize(
     "curve",
     [